@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+## @package build_aot
+#  Compiles the timeconvs kernels ahead of time into the timeconvs_kernels extension module.
+#
+#  When timeconvs_kernels is importable, timeconvs uses it instead of compiling the kernels just in time,
+#  so there is no JIT warm-up and numba is not needed at runtime. The ahead-of-time kernels run on a single
+#  thread, while the JIT ones are parallel.
+#
+#  Usage (requires numba):
+#
+#    python build_aot.py
+#
+
+from numba.pycc import CC
+
+import timeconvs
+
+
+cc = CC("timeconvs_kernels")
+cc.export("apply_piecewise", "void(f8[::1], f8[::1], f8[::1], f8[::1], f8[::1])")(timeconvs._piecewise_kernel)
+cc.export("apply_piecewise_f32", "void(f4[::1], f8[::1], f8[::1], f8[::1], f4[::1])")(timeconvs._piecewise_kernel)
+cc.export("apply_piecewise_sorted", "void(f8[::1], f8[::1], f8[::1], f8[::1], f8[::1])")(
+	timeconvs._piecewise_sorted_kernel)
+cc.export("apply_piecewise_sorted_f32", "void(f4[::1], f8[::1], f8[::1], f8[::1], f4[::1])")(
+	timeconvs._piecewise_sorted_kernel)
+
+
+if __name__ == "__main__":
+	cc.compile()
@@ -20,7 +20,13 @@
 #        - convert_dvs_to_rs()
 #        - convert_dvs_to_lidar()
 #
-#    2. between native and relative formats:
+#    2. between sensors, from native to relative format of the target sensor (in a single pass):
+#        - rs_native_to_dvs_relative()
+#        - lidar_native_to_dvs_relative()
+#        - dvs_native_to_rs_relative()
+#        - dvs_native_to_lidar_relative()
+#
+#    3. between native and relative formats:
 #        - dvs_native_to_relative()
 #        - dvs_relative_to_native()
 #        - lidar_native_to_relative()
@@ -28,6 +34,17 @@
 #        - rs_native_to_relative()
 #        - rs_relative_to_native()
 #
+#  The sensor conversions are also available on the GPU for cupy arrays (requires cupy, experimental), e.g. for
+#  large lidar point clouds already on the device:
+#        - convert_rs_to_dvs_gpu()
+#        - convert_lidar_to_dvs_gpu()
+#        - convert_dvs_to_rs_gpu()
+#        - convert_dvs_to_lidar_gpu()
+#
+#  The sensor conversions accept dtype=np.float32 to halve the memory traffic on large arrays. The conversion
+#  itself is still evaluated in float64, but float32 represents integers exactly only up to 2^24 (~16.7 s of DVS
+#  microseconds), so keep the default float64 for timestamps with a large offset and always for lidar nanoseconds.
+#
 #  Usage example:
 #
 #    import timeconvs
@@ -38,20 +55,144 @@
 #    <...use timeconvs functions...>
 #
 
+import math
+import threading
+from bisect import bisect_left
+
 import numpy as np
-import json
+
+try:
+	import orjson as json
+except ImportError:
+	import json
+
+try:
+	import numba
+except ImportError:
+	numba = None
+
+try:
+	import numexpr
+except ImportError:
+	numexpr = None
+
+try:
+	import cupy
+except ImportError:
+	cupy = None
+
+try:
+	# kernels compiled ahead of time by build_aot.py
+	import timeconvs_kernels
+except ImportError:
+	timeconvs_kernels = None
 
 
 TIMECONVS = None
+TIMECONVS_ARR = {}
+TIMECONVS_FAST = {}
+TIMECONVS_REL = {}
+
+CONVERSION_DIRECTIONS = ("rs_to_dvs", "lidar_to_dvs", "dvs_to_rs", "dvs_to_lidar")
+SENSORS = ("dvs", "lidar", "rs")
+GPU_CONVERSIONS = tuple(direction + "_gpu" for direction in CONVERSION_DIRECTIONS)
+RELATIVE_CONVERSIONS = tuple(
+	sensor + suffix for sensor in SENSORS for suffix in ("_native_to_relative", "_relative_to_native"))
+## Sensor conversions fused with the native to relative conversion of the target sensor,
+#  as name: (conversion direction, relative conversion).
+FUSED_CONVERSIONS = {
+	"rs_native_to_dvs_relative": ("rs_to_dvs", "dvs_native_to_relative"),
+	"lidar_native_to_dvs_relative": ("lidar_to_dvs", "dvs_native_to_relative"),
+	"dvs_native_to_rs_relative": ("dvs_to_rs", "rs_native_to_relative"),
+	"dvs_native_to_lidar_relative": ("dvs_to_lidar", "lidar_native_to_relative"),
+}
 
 
 ## Loads timeconvs.json data from string.
 #
+#  Besides the raw TIMECONVS dict, precomputes TIMECONVS_ARR: for every conversion direction a tuple of
+#  contiguous float64 arrays (lo, hi, k, b) describing the (lo, hi] intervals and their conv_k / conv_b.
+#  Open interval ends are replaced by -inf / +inf, so no special handling of the "inner" flag is needed,
+#  and the intervals are sorted and checked to partition the whole timeline.
+#  Directions with a single interval additionally get their (k, b) in TIMECONVS_FAST.
+#  The native <-> relative conversions are stored in TIMECONVS_REL as (k, b) of ts * k + b.
+#  FUSED_CONVERSIONS get the composition of both conversions in TIMECONVS_ARR (and TIMECONVS_FAST).
+#  Finally, the conversion functions specialized to this data are installed into _CONVERTERS
+#  (for GPU_CONVERSIONS only if cupy is available, their tables are copied to the GPU on first use).
+#  Nothing of this is replaced unless the whole data is valid, otherwise RuntimeError is raised
+#  (for missing keys, malformed values and intervals that do not partition the timeline; a string
+#  that is not JSON at all raises the ValueError of the json module).
+#
 #  @type json_string: string
-#  @param json_string: timeconvs data as string
+#  @param json_string: timeconvs data as string (or bytes)
 def load_from_json_string(json_string):
 	global TIMECONVS
-	TIMECONVS = json.loads(json_string)
+	# everything is built and validated aside first, so that invalid data leaves the loaded data untouched
+	timeconvs = json.loads(json_string)
+	timeconvs_arr = {}
+	timeconvs_fast = {}
+	timeconvs_rel = {}
+	converters = {}
+	try:
+		for sensor in SENSORS:
+			scale = timeconvs[sensor + "_timestamp_scale"]
+			offset = timeconvs[sensor + "_offset_s"]
+			timeconvs_rel[sensor + "_native_to_relative"] = (scale, -offset)
+			timeconvs_rel[sensor + "_relative_to_native"] = (1.0 / scale, offset / scale)
+		for name in RELATIVE_CONVERSIONS:
+			converters[name] = _make_affine(*timeconvs_rel[name])
+		for direction in CONVERSION_DIRECTIONS:
+			intervals = timeconvs[direction]
+			n = len(intervals)
+			lo = np.empty(n, dtype=np.float64)
+			hi = np.empty(n, dtype=np.float64)
+			k = np.empty(n, dtype=np.float64)
+			b = np.empty(n, dtype=np.float64)
+			for i, tc in enumerate(intervals):
+				interval = tc["interval"]
+				lo[i] = -np.inf if interval[0] is None else interval[0]
+				hi[i] = np.inf if interval[1] is None else interval[1]
+				k[i] = tc["conv_k"]
+				b[i] = tc["conv_b"]
+			# the conversions rely on the intervals partitioning the real line
+			if n == 0:
+				raise RuntimeError(f"timeconvs intervals of {direction} do not partition the timeline")
+			order = np.argsort(hi)
+			lo, hi, k, b = lo[order], hi[order], k[order], b[order]
+			if lo[0] != -np.inf or hi[-1] != np.inf or np.any(lo[1:] != hi[:-1]):
+				raise RuntimeError(f"timeconvs intervals of {direction} do not partition the timeline")
+			timeconvs_arr[direction] = (lo, hi, k, b)
+			if n == 1:
+				timeconvs_fast[direction] = (k[0], b[0])
+	except KeyError as e:
+		raise RuntimeError(f"timeconvs data lack the key {e}") from e
+	except (IndexError, TypeError, ValueError, ZeroDivisionError) as e:
+		raise RuntimeError(f"timeconvs data are malformed: {e}") from e
+	for direction in CONVERSION_DIRECTIONS:
+		hi, k, b = timeconvs_arr[direction][1:]
+		if numba is not None and timeconvs_kernels is None:
+			# compiling now keeps the JIT warm-up out of the first conversion
+			_PIECEWISE_KERNELS[np.float64](np.zeros(1), hi[:-1], k, b, np.empty(1))
+			_SORTED_KERNELS[np.float64](np.zeros(1), hi[:-1], k, b, np.empty(1))
+		converters[direction] = _make_converter(timeconvs_arr[direction], timeconvs_fast.get(direction))
+		if cupy is not None:
+			converters[direction + "_gpu"] = _make_gpu_converter(timeconvs_arr[direction])
+	for name, (direction, relative) in FUSED_CONVERSIONS.items():
+		lo, hi, k, b = timeconvs_arr[direction]
+		rel_k, rel_b = timeconvs_rel[relative]
+		# (ts * k + b) * rel_k + rel_b == ts * (k * rel_k) + (b * rel_k + rel_b)
+		k = k * rel_k
+		b = b * rel_k + rel_b
+		timeconvs_arr[name] = (lo, hi, k, b)
+		if k.size == 1:
+			timeconvs_fast[name] = (k[0], b[0])
+		converters[name] = _make_converter(timeconvs_arr[name], timeconvs_fast.get(name))
+	TIMECONVS = timeconvs
+	for loaded, new in (
+			(TIMECONVS_ARR, timeconvs_arr), (TIMECONVS_FAST, timeconvs_fast), (TIMECONVS_REL, timeconvs_rel)):
+		loaded.clear()
+		loaded.update(new)
+	_CONVERTERS.update(converters)
 
 
 ## Loads timeconvs.json data from file.
@@ -59,144 +200,485 @@ def load_from_json_string(json_string):
 #  @type filename: string
 #  @param filename: path to timeconvs.json file
 def load_from_file(filename):
-	with open(filename, 'r') as infile:
+	# both json modules parse bytes directly, which skips decoding the file into a str first
+	with open(filename, 'rb') as infile:
 		load_from_json_string(infile.read())
 
 
+_prange = range if numba is None else numba.prange
+
+
+## Kernel of the piecewise linear conversion, fusing the interval search and the multiply-add.
+#
+#  Compiled either ahead of time by build_aot.py or just in time by numba, see _PIECEWISE_KERNELS.
+#  The conversion is evaluated in float64 and only the result is rounded to the dtype of out.
+#
+#  @type ts: 1D float64 | float32 numpy array
+#  @param ts: native timestamps of the source sensor
+#  @type bounds: 1D float64 numpy array
+#  @param bounds: sorted inner interval boundaries (hi[:-1])
+#  @type k: 1D float64 numpy array
+#  @param k: conv_k of every interval
+#  @type b: 1D float64 numpy array
+#  @param b: conv_b of every interval
+#  @type out: 1D numpy array of the same dtype as ts
+#  @param out: output array of the same size as ts
+def _piecewise_kernel(ts, bounds, k, b, out):
+	for i in _prange(ts.size):
+		# there are only a handful of intervals, so a branchless linear scan is cheaper than a binary search
+		j = 0
+		for m in range(bounds.size):
+			j += ts[i] > bounds[m]
+		out[i] = ts[i] * k[j] + b[j]
+
+
+## Kernel of the piecewise linear conversion of timestamps sorted in ascending order.
+#
+#  The timestamps of every interval form a contiguous block, so each block is a plain multiply-add
+#  with k and b fixed, which the compiler vectorizes into SIMD FMA instructions.
+#  Arguments are the same as of _piecewise_kernel(), ts must be sorted.
+def _piecewise_sorted_kernel(ts, bounds, k, b, out):
+	start = 0
+	for j in range(k.size):
+		end = ts.size if j == bounds.size else np.searchsorted(ts, bounds[j], side="right")
+		for i in _prange(start, end):
+			out[i] = ts[i] * k[j] + b[j]
+		start = end
+
+
+## Compiled _piecewise_kernel and _piecewise_sorted_kernel for every supported timestamp dtype.
+if timeconvs_kernels is not None:
+	_PIECEWISE_KERNELS = {
+		np.float64: timeconvs_kernels.apply_piecewise,
+		np.float32: timeconvs_kernels.apply_piecewise_f32,
+	}
+	_SORTED_KERNELS = {
+		np.float64: timeconvs_kernels.apply_piecewise_sorted,
+		np.float32: timeconvs_kernels.apply_piecewise_sorted_f32,
+	}
+elif numba is not None:
+	# a numba dispatcher compiles a specialization for every dtype itself
+	_PIECEWISE_KERNELS = dict.fromkeys(
+		(np.float64, np.float32), numba.njit(parallel=True, fastmath=True, cache=True)(_piecewise_kernel))
+	_SORTED_KERNELS = dict.fromkeys(
+		(np.float64, np.float32), numba.njit(parallel=True, fastmath=True, cache=True)(_piecewise_sorted_kernel))
+else:
+	_PIECEWISE_KERNELS = {}
+	_SORTED_KERNELS = {}
+
+
+## Minimal array size for which numexpr is faster than plain numpy.
+_NUMEXPR_MIN_SIZE = 1 << 16
+
+
+## Maximal number of inner interval boundaries for which counting the boundaries below every timestamp
+#  is faster than np.searchsorted, which suffers from branch mispredictions on unsorted timestamps.
+_SCAN_MAX_BOUNDS = 8
+## Minimal array size for the boundary counting, smaller arrays are dominated by the per-call overhead of its
+#  several numpy calls, for which a single np.searchsorted is cheaper.
+_SCAN_MIN_SIZE = 1 << 12
+
+
+## Range of array sizes for which scratch buffers are reused instead of allocated on every call. Larger
+#  arrays are allocated normally, so that at most ~50 MB of scratch buffers stay allocated per thread.
+_SCRATCH_MIN_SIZE = 1 << 12
+_SCRATCH_MAX_SIZE = 1 << 20
+
+## Number of array sizes for which scratch buffers are kept (per thread), e.g. the chunk size of a stream
+#  and its last partial chunk.
+_SCRATCH_MAX_SIZES = 2
+
+_scratch_pools = threading.local()
+
+
+## Returns a scratch array, reusing the one from a previous call with the same name and size.
+#
+#  Converting equally sized chunks of a stream then needs no allocation of temporaries. Scratch arrays are
+#  kept only for the _SCRATCH_MAX_SIZES most recently used sizes and must never be returned to the caller.
+#
+#  @type name: string
+#  @param name: name of the scratch array, distinguishes arrays needed at the same time
+#  @type shape: tuple
+#  @param shape: shape of the scratch array
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the scratch array
+#
+#  @rtype: numpy array
+#  @return: uninitialized array of the given shape and dtype
+def _scratch(name, shape, dtype):
+	n = math.prod(shape)
+	if n < _SCRATCH_MIN_SIZE or n > _SCRATCH_MAX_SIZE:
+		return np.empty(shape, dtype=dtype)
+	pools = getattr(_scratch_pools, "pools", None)
+	if pools is None:
+		pools = _scratch_pools.pools = {}
+	# the most recently used size is kept last
+	pool = pools.pop(n, None)
+	if pool is None:
+		pool = {}
+		if len(pools) >= _SCRATCH_MAX_SIZES:
+			del pools[next(iter(pools))]
+	pools[n] = pool
+	key = (name, np.dtype(dtype))
+	if key not in pool:
+		pool[key] = np.empty(n, dtype=dtype)
+	return pool[key].reshape(shape)
+
+
+## Releases the scratch buffers kept by the conversions of the calling thread.
+def clear_scratch():
+	_scratch_pools.pools = {}
+
+
+## Computes res = ts * k + b in place, using multiple threads through numexpr for large arrays.
+#
+#  @type ts: numpy array
+#  @param ts: timestamps
+#  @type k: float | numpy array
+#  @param k: multiplier(s), scalar or of the same shape as ts (may be res itself)
+#  @type b: float | numpy array
+#  @param b: offset(s), scalar or of the same shape as ts
+#  @type res: float64 numpy array
+#  @param res: output array of the same shape as ts
+def _multiply_add(ts, k, b, res):
+	if numexpr is not None and res.size >= _NUMEXPR_MIN_SIZE:
+		numexpr.evaluate("ts * k + b", local_dict={"ts": ts, "k": k, "b": b}, out=res)
+	else:
+		np.multiply(ts, k, out=res)
+		np.add(res, b, out=res)
+
+
+## Creates the piecewise linear conversion function of one direction.
+#
+#  Everything that does not depend on the converted timestamps is resolved here, once at load time.
+#
+#  @type arrays: tuple of numpy arrays
+#  @param arrays: (lo, hi, k, b) of the direction, see TIMECONVS_ARR
+#  @type fast: tuple of floats | None
+#  @param fast: (k, b) of the direction if it has a single interval, see TIMECONVS_FAST
+#
+#  @rtype: function
+#  @return: function(ts, dtype, is_sorted) converting native timestamp(s) of the source sensor
+#           to native timestamp(s) of the target sensor, see convert_rs_to_dvs()
+def _make_converter(arrays, fast):
+	hi, k, b = arrays[1:]
+	bounds = hi[:-1]
+	# single timestamps are converted in plain Python, which is much cheaper than the array path for them
+	bounds_list = bounds.tolist()
+	k_list = k.tolist()
+	b_list = b.tolist()
+
+	def convert(ts, dtype, is_sorted):
+		if dtype is np.float64 and np.isscalar(ts):
+			ts = float(ts)
+			j = bisect_left(bounds_list, ts)
+			return ts * k_list[j] + b_list[j]
+		arr = np.asarray(ts, dtype=dtype)
+		# no need to zero out, every element is written below: the intervals partition the timeline (checked at
+		# load time), and NaN timestamps land in the first or last interval and convert to NaN
+		out = np.empty(arr.shape, dtype=dtype)
+		kernel = (_SORTED_KERNELS if is_sorted else _PIECEWISE_KERNELS).get(out.dtype.type)
+		if kernel is not None:
+			kernel(np.ascontiguousarray(arr).reshape(-1), bounds, k, b, out.reshape(-1))
+		else:
+			# evaluate in float64, only the result is rounded to dtype
+			res = out if out.dtype == np.float64 else _scratch("res", arr.shape, np.float64)
+			if fast is not None:
+				# the whole timeline is a single interval, no need to search for it
+				_multiply_add(arr, fast[0], fast[1], res)
+			elif is_sorted:
+				# the timestamps of every interval form a contiguous block, convert block by block without any gather
+				ts_flat = arr.reshape(-1)
+				res_flat = res.reshape(-1)
+				cuts = np.searchsorted(ts_flat, bounds, side="right")
+				start = 0
+				for j, end in enumerate(cuts.tolist() + [ts_flat.size]):
+					_multiply_add(ts_flat[start:end], k[j], b[j], res_flat[start:end])
+					start = end
+			else:
+				# intervals are sorted and partition the real line, so the index of the (lo, hi] interval
+				# of a timestamp is the number of inner boundaries below it
+				if bounds.size <= _SCAN_MAX_BOUNDS and arr.size >= _SCAN_MIN_SIZE:
+					idx = _scratch("idx", arr.shape, np.intp)
+					np.greater(arr, bounds[0], out=idx)
+					if bounds.size > 1:
+						above = _scratch("above", arr.shape, np.bool_)
+						for bound in bounds[1:]:
+							np.greater(arr, bound, out=above)
+							idx += above
+				else:
+					idx = np.searchsorted(bounds, arr, side="left")
+				# multiply-add in place over the gathered k to avoid full-size temporaries; the indices are
+				# always valid, and mode="clip" skips the bounds check and the buffered copy of out that "raise" needs
+				np.take(k, idx, out=res, mode="clip")
+				b_gathered = np.take(b, idx, out=_scratch("b", arr.shape, np.float64), mode="clip")
+				_multiply_add(arr, res, b_gathered, res)
+			if res is not out:
+				out[...] = res
+		return out.item() if np.isscalar(ts) else out
+
+	return convert
+
+
+## Creates the native <-> relative conversion function ts * k + b.
+#
+#  @type k: float
+#  @param k: multiplier, see TIMECONVS_REL
+#  @type b: float
+#  @param b: offset, see TIMECONVS_REL
+#
+#  @rtype: function
+#  @return: function(ts) converting the timestamp(s)
+def _make_affine(k, b):
+	def convert(ts):
+		return ts * k + b
+
+	return convert
+
+
+if cupy is not None:
+	## GPU kernel of the piecewise linear conversion, see _piecewise_kernel(); m is the number of bounds.
+	_GPU_PIECEWISE_KERNEL = cupy.ElementwiseKernel(
+		"T ts, raw float64 bounds, raw float64 k, raw float64 b, int64 m",
+		"T out",
+		"""
+		long long j = 0;
+		for (long long i = 0; i < m; i++) {
+			j += ts > bounds[i];
+		}
+		out = ts * k[j] + b[j];
+		""",
+		"timeconvs_piecewise")
+
+
+## Creates the GPU piecewise linear conversion function of one direction.
+#
+#  @type arrays: tuple of numpy arrays
+#  @param arrays: (lo, hi, k, b) of the direction, see TIMECONVS_ARR
+#
+#  @rtype: function
+#  @return: function(ts, dtype) converting native timestamps of the source sensor
+#           to native timestamps of the target sensor, see convert_rs_to_dvs_gpu()
+def _make_gpu_converter(arrays):
+	hi, k, b = arrays[1:]
+	# (bounds, k, b) on the GPU, copied there only on first use, so that loading (and the CPU conversions)
+	# work also where cupy is installed without a usable CUDA device
+	gpu_tables = []
+
+	def convert(ts, dtype):
+		if not gpu_tables:
+			gpu_tables.extend((cupy.asarray(hi[:-1]), cupy.asarray(k), cupy.asarray(b)))
+		gpu_bounds, gpu_k, gpu_b = gpu_tables
+		ts = cupy.asarray(ts, dtype=dtype)
+		return _GPU_PIECEWISE_KERNEL(ts, gpu_bounds, gpu_k, gpu_b, gpu_bounds.size)
+
+	return convert
+
+
+## Stands in for all conversion functions until timeconvs data is loaded.
+def _not_loaded(*args):
+	raise RuntimeError("timeconvs data not loaded, call load_from_file() first")
+
+
+## Stands in for the GPU conversion functions if cupy is not installed.
+def _no_cupy(*args):
+	raise RuntimeError("GPU conversions require cupy")
+
+
+## Conversion functions by name, replaced with the loaded ones by load_from_json_string().
+#  The public functions below dispatch through this dict, so they need no check whether data is loaded.
+_CONVERTERS = dict.fromkeys(
+	CONVERSION_DIRECTIONS + GPU_CONVERSIONS + RELATIVE_CONVERSIONS + tuple(FUSED_CONVERSIONS), _not_loaded)
+if cupy is None:
+	_CONVERTERS.update(dict.fromkeys(GPU_CONVERSIONS, _no_cupy))
+
+
 ## Converts Realsense native timestamp(s) to DVS native timestamp(s).
 #
 #  @type rs_ts: float | numpy array
 #  @param rs_ts: realsense native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if rs_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
 #
 #  @rtype: float | numpy array
-#  @return: DVS native timestamp(s) as the same data type value(s)
-def convert_rs_to_dvs(rs_ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	is_numpy_array = (type(rs_ts) is np.ndarray)
-	if is_numpy_array:
-		dvs_ts = np.full_like(rs_ts, 0)
-	else:
-		dvs_ts = None
-	# converting
-	for tc in timeconvs["rs_to_dvs"]:
-		interval = tc["interval"]
-		if tc["inner"]:
-			indexes = (rs_ts > interval[0]) & (rs_ts <= interval[1])
-		elif interval[0] is None:
-			indexes = (rs_ts <= interval[1])
-		elif interval[1] is None:
-			indexes = (rs_ts > interval[0])
-		else:
-			raise RuntimeError
-		if is_numpy_array:
-			dvs_ts[indexes] = rs_ts[indexes] * tc["conv_k"] + tc["conv_b"]
-		elif indexes:
-			dvs_ts = rs_ts * tc["conv_k"] + tc["conv_b"]
-	return dvs_ts
+#  @return: DVS native timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def convert_rs_to_dvs(rs_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["rs_to_dvs"](rs_ts, dtype, is_sorted)
 
 
 ## Converts Lidar native timestamp(s) to DVS native timestamp(s).
 #
 #  @type lidar_ts: float | numpy array
 #  @param lidar_ts: lidar native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if lidar_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
 #
 #  @rtype: float | numpy array
-#  @return: DVS native timestamp(s) as the same data type value(s)
-def convert_lidar_to_dvs(lidar_ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	is_numpy_array = (type(lidar_ts) is np.ndarray)
-	if is_numpy_array:
-		dvs_ts = np.full_like(lidar_ts, 0)
-	else:
-		dvs_ts = None
-	# converting
-	for tc in timeconvs["lidar_to_dvs"]:
-		interval = tc["interval"]
-		if tc["inner"]:
-			indexes = (lidar_ts > interval[0]) & (lidar_ts <= interval[1])
-		elif interval[0] is None:
-			indexes = (lidar_ts <= interval[1])
-		elif interval[1] is None:
-			indexes = (lidar_ts > interval[0])
-		else:
-			raise RuntimeError
-		if is_numpy_array:
-			dvs_ts[indexes] = lidar_ts[indexes] * tc["conv_k"] + tc["conv_b"]
-		elif indexes:
-			dvs_ts = lidar_ts * tc["conv_k"] + tc["conv_b"]
-	return dvs_ts
+#  @return: DVS native timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def convert_lidar_to_dvs(lidar_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["lidar_to_dvs"](lidar_ts, dtype, is_sorted)
 
 
 ## Converts DVS native timestamp(s) to Realsense native timestamp(s).
 #
 #  @type dvs_ts: float | numpy array
 #  @param dvs_ts: DVS native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if dvs_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
 #
 #  @rtype: float | numpy array
-#  @return: realsense native timestamp(s) as the same data type value(s)
-def convert_dvs_to_rs(dvs_ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	is_numpy_array = (type(dvs_ts) is np.ndarray)
-	if is_numpy_array:
-		rs_ts = np.full_like(dvs_ts, 0)
-	else:
-		rs_ts = None
-	# converting
-	for tc in timeconvs["dvs_to_rs"]:
-		interval = tc["interval"]
-		if tc["inner"]:
-			indexes = (dvs_ts > interval[0]) & (dvs_ts <= interval[1])
-		elif interval[0] is None:
-			indexes = (dvs_ts <= interval[1])
-		elif interval[1] is None:
-			indexes = (dvs_ts > interval[0])
-		else:
-			raise RuntimeError
-		if is_numpy_array:
-			rs_ts[indexes] = dvs_ts[indexes] * tc["conv_k"] + tc["conv_b"]
-		elif indexes:
-			rs_ts = dvs_ts * tc["conv_k"] + tc["conv_b"]
-	return rs_ts
+#  @return: realsense native timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def convert_dvs_to_rs(dvs_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["dvs_to_rs"](dvs_ts, dtype, is_sorted)
 
 
 ## Converts DVS native timestamp(s) to Lidar native timestamp(s).
 #
 #  @type dvs_ts: float | numpy array
 #  @param dvs_ts: DVS native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if dvs_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
 #
 #  @rtype: float | numpy array
-#  @return: lidar native timestamp(s) as the same data type value(s)
-def convert_dvs_to_lidar(dvs_ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	is_numpy_array = (type(dvs_ts) is np.ndarray)
-	if is_numpy_array:
-		lidar_ts = np.full_like(dvs_ts, 0)
-	else:
-		lidar_ts = None
-	# converting
-	for tc in timeconvs["dvs_to_lidar"]:
-		interval = tc["interval"]
-		if tc["inner"]:
-			indexes = (dvs_ts > interval[0]) & (dvs_ts <= interval[1])
-		elif interval[0] is None:
-			indexes = (dvs_ts <= interval[1])
-		elif interval[1] is None:
-			indexes = (dvs_ts > interval[0])
-		else:
-			raise RuntimeError
-		if is_numpy_array:
-			lidar_ts[indexes] = dvs_ts[indexes] * tc["conv_k"] + tc["conv_b"]
-		elif indexes:
-			lidar_ts = dvs_ts * tc["conv_k"] + tc["conv_b"]
-	return lidar_ts
+#  @return: lidar native timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def convert_dvs_to_lidar(dvs_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["dvs_to_lidar"](dvs_ts, dtype, is_sorted)
+
+
+## Converts Realsense native timestamps to DVS native timestamps on the GPU.
+#
+#  Worth it only if the timestamps already are on the GPU, otherwise the transfer costs more than the conversion.
+#
+#  @type rs_ts: cupy array
+#  @param rs_ts: realsense native timestamps
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#
+#  @rtype: cupy array
+#  @return: DVS native timestamps
+def convert_rs_to_dvs_gpu(rs_ts, dtype=np.float64):
+	return _CONVERTERS["rs_to_dvs_gpu"](rs_ts, dtype)
+
+
+## Converts Lidar native timestamps to DVS native timestamps on the GPU.
+#
+#  Worth it only if the timestamps already are on the GPU, otherwise the transfer costs more than the conversion.
+#
+#  @type lidar_ts: cupy array
+#  @param lidar_ts: lidar native timestamps
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#
+#  @rtype: cupy array
+#  @return: DVS native timestamps
+def convert_lidar_to_dvs_gpu(lidar_ts, dtype=np.float64):
+	return _CONVERTERS["lidar_to_dvs_gpu"](lidar_ts, dtype)
+
+
+## Converts DVS native timestamps to Realsense native timestamps on the GPU.
+#
+#  Worth it only if the timestamps already are on the GPU, otherwise the transfer costs more than the conversion.
+#
+#  @type dvs_ts: cupy array
+#  @param dvs_ts: DVS native timestamps
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#
+#  @rtype: cupy array
+#  @return: realsense native timestamps
+def convert_dvs_to_rs_gpu(dvs_ts, dtype=np.float64):
+	return _CONVERTERS["dvs_to_rs_gpu"](dvs_ts, dtype)
+
+
+## Converts DVS native timestamps to Lidar native timestamps on the GPU.
+#
+#  Worth it only if the timestamps already are on the GPU, otherwise the transfer costs more than the conversion.
+#
+#  @type dvs_ts: cupy array
+#  @param dvs_ts: DVS native timestamps
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#
+#  @rtype: cupy array
+#  @return: lidar native timestamps
+def convert_dvs_to_lidar_gpu(dvs_ts, dtype=np.float64):
+	return _CONVERTERS["dvs_to_lidar_gpu"](dvs_ts, dtype)
+
+
+## Converts Realsense native timestamp(s) to DVS relative timestamp(s).
+#
+#  Same as the sensor conversion followed by the native to relative conversion, but in a single pass.
+#
+#  @type rs_ts: float | numpy array
+#  @param rs_ts: realsense native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if rs_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
+#
+#  @rtype: float | numpy array
+#  @return: DVS relative timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def rs_native_to_dvs_relative(rs_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["rs_native_to_dvs_relative"](rs_ts, dtype, is_sorted)
+
+
+## Converts Lidar native timestamp(s) to DVS relative timestamp(s).
+#
+#  Same as the sensor conversion followed by the native to relative conversion, but in a single pass.
+#
+#  @type lidar_ts: float | numpy array
+#  @param lidar_ts: lidar native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if lidar_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
+#
+#  @rtype: float | numpy array
+#  @return: DVS relative timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def lidar_native_to_dvs_relative(lidar_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["lidar_native_to_dvs_relative"](lidar_ts, dtype, is_sorted)
+
+
+## Converts DVS native timestamp(s) to Realsense relative timestamp(s).
+#
+#  Same as the sensor conversion followed by the native to relative conversion, but in a single pass.
+#
+#  @type dvs_ts: float | numpy array
+#  @param dvs_ts: DVS native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if dvs_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
+#
+#  @rtype: float | numpy array
+#  @return: realsense relative timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def dvs_native_to_rs_relative(dvs_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["dvs_native_to_rs_relative"](dvs_ts, dtype, is_sorted)
+
+
+## Converts DVS native timestamp(s) to Lidar relative timestamp(s).
+#
+#  Same as the sensor conversion followed by the native to relative conversion, but in a single pass.
+#
+#  @type dvs_ts: float | numpy array
+#  @param dvs_ts: DVS native timestamp(s)
+#  @type dtype: numpy dtype
+#  @param dtype: dtype of the timestamps, float64 or float32 (see the precision note above)
+#  @type is_sorted: bool
+#  @param is_sorted: set if dvs_ts is sorted in ascending order (e.g. a sensor stream) for a faster conversion
+#
+#  @rtype: float | numpy array
+#  @return: lidar relative timestamp(s) as float for a single timestamp, otherwise as numpy array of dtype
+def dvs_native_to_lidar_relative(dvs_ts, dtype=np.float64, is_sorted=False):
+	return _CONVERTERS["dvs_native_to_lidar_relative"](dvs_ts, dtype, is_sorted)
 
 
 ## Converts DVS native timestamp(s) to relative.
@@ -207,10 +689,7 @@ def convert_dvs_to_lidar(dvs_ts):
 #  @rtype: float | numpy array
 #  @return: DVS relative timestamp(s) as the same data type value(s)
 def dvs_native_to_relative(ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	return ts * timeconvs["dvs_timestamp_scale"] - timeconvs["dvs_offset_s"]
+	return _CONVERTERS["dvs_native_to_relative"](ts)
 
 
 ## Converts DVS relative timestamp(s) to native.
@@ -221,10 +700,7 @@ def dvs_native_to_relative(ts):
 #  @rtype: float | numpy array
 #  @return: DVS native timestamp(s) as the same data type value(s)
 def dvs_relative_to_native(ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	return (ts + timeconvs["dvs_offset_s"]) / timeconvs["dvs_timestamp_scale"]
+	return _CONVERTERS["dvs_relative_to_native"](ts)
 
 
 ## Converts Lidar native timestamp(s) to relative.
@@ -235,10 +711,7 @@ def dvs_relative_to_native(ts):
 #  @rtype: float | numpy array
 #  @return: lidar relative timestamp(s) as the same data type value(s)
 def lidar_native_to_relative(ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	return ts * timeconvs["lidar_timestamp_scale"] - timeconvs["lidar_offset_s"]
+	return _CONVERTERS["lidar_native_to_relative"](ts)
 
 
 ## Converts Lidar relative timestamp(s) to native.
@@ -249,10 +722,7 @@ def lidar_native_to_relative(ts):
 #  @rtype: float | numpy array
 #  @return: lidar native timestamp(s) as the same data type value(s)
 def lidar_relative_to_native(ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	return (ts + timeconvs["lidar_offset_s"]) / timeconvs["lidar_timestamp_scale"]
+	return _CONVERTERS["lidar_relative_to_native"](ts)
 
 
 ## Converts Realsense native timestamp(s) to relative.
@@ -263,10 +733,7 @@ def lidar_relative_to_native(ts):
 #  @rtype: float | numpy array
 #  @return: realsense relative timestamp(s) as the same data type value(s)
 def rs_native_to_relative(ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	return ts * timeconvs["rs_timestamp_scale"] - timeconvs["rs_offset_s"]
+	return _CONVERTERS["rs_native_to_relative"](ts)
 
 
 ## Converts Realsense relative timestamp(s) to native.
@@ -277,8 +744,5 @@ def rs_native_to_relative(ts):
 #  @rtype: float | numpy array
 #  @return: realsense native timestamp(s) as the same data type value(s)
 def rs_relative_to_native(ts):
-	if not TIMECONVS:
-		raise RuntimeError
-	timeconvs = TIMECONVS
-	return (ts + timeconvs["rs_offset_s"]) / timeconvs["rs_timestamp_scale"]
+	return _CONVERTERS["rs_relative_to_native"](ts)
 